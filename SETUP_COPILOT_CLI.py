@@ -22,12 +22,12 @@ flow without further prompts.
 
 from __future__ import annotations
 
+import functools
 import getpass
 import os
 import shutil
 import subprocess
 import sys
-from itertools import chain
 from typing import cast
 
 PAT_ENV_KEYS: tuple[str, ...] = (
@@ -45,14 +45,44 @@ ADDITIONAL_COPILOT_ENV_KEYS: tuple[str, ...] = (
     "GH_COPILOT_TOKEN",
 )
 
+# The helper never mutates its own environment, so snapshot it once at import.
+_BASE_ENV: dict[str, str] = dict(os.environ)
 
+_COPILOT_KEYS: tuple[str, ...] = tuple(
+    dict.fromkeys(PAT_ENV_KEYS + ADDITIONAL_COPILOT_ENV_KEYS),
+)
+
+
+@functools.lru_cache(maxsize=None)
+def _which_cached(name: str) -> str | None:
+    return shutil.which(name)
+
+
+_POWERSHELL = _which_cached("powershell") or "powershell"
+_CREATE_NEW_PROCESS_GROUP: int = getattr(subprocess, "CREATE_NEW_PROCESS_GROUP", 0)
+_CREATE_NO_WINDOW: int = getattr(subprocess, "CREATE_NO_WINDOW", 0)
+_PROBE_ARGS: tuple[str, ...] = (
+    "--prompt",
+    "Copilot CLI setup probe",
+    "--allow-all-tools",
+    "--stream",
+    "off",
+    "--no-color",
+)
+_PROBE_COMMAND = (
+    "Set-ExecutionPolicy -Scope Process -ExecutionPolicy Bypass -Force; "
+    "copilot --prompt 'Copilot CLI setup probe' --allow-all-tools "
+    "--stream off --no-color"
+)
+_LAUNCH_COMMAND = (
+    "Set-ExecutionPolicy -Scope Process -ExecutionPolicy Bypass -Force; copilot"
+)
+
+
+@functools.lru_cache(maxsize=1)
 def _resolve_pat() -> str | None:
     env = os.environ
-    for key in PAT_ENV_KEYS:
-        value = env.get(key)
-        if value:
-            return value.strip()
-    return None
+    return next((value.strip() for key in PAT_ENV_KEYS if (value := env.get(key))), None)
 
 
 def _prompt_pat() -> str | None:
@@ -72,54 +102,77 @@ def _ensure_copilot_cli() -> str | None:
         "copilot.ps1",
     )
     for name in candidates:
-        tool = shutil.which(name)
+        tool = _which_cached(name)
         if tool:
             return tool
     return None
 
 
 def _build_env(pat: str) -> dict[str, str]:
-    env = dict(os.environ)
-    for key in chain(PAT_ENV_KEYS, ADDITIONAL_COPILOT_ENV_KEYS):
-        env[key] = pat
+    env = _BASE_ENV.copy()
+    env.update(dict.fromkeys(_COPILOT_KEYS, pat))
     env.setdefault("COPILOT_ALLOW_ALL", "1")
     env.setdefault("COPILOT_CLI_ALLOW_UNSAFE", "1")
     return env
 
 
-def _run_probe(env: dict[str, str]) -> subprocess.CompletedProcess[str]:
-    powershell = shutil.which("powershell") or "powershell"
-    command = (
-        "Set-ExecutionPolicy -Scope Process -ExecutionPolicy Bypass -Force; "
-        "copilot --prompt 'Copilot CLI setup probe' --allow-all-tools "
-        "--stream off --no-color"
-    )
-    try:
-        return subprocess.run(  # noqa: S603 - command assembled from trusted args
-            [powershell, "-NoProfile", "-Command", command],
+def _kill_process_tree(proc: subprocess.Popen[str]) -> None:
+    if os.name == "nt":
+        subprocess.run(  # noqa: S603 - taskkill with fixed arguments
+            ["taskkill", "/T", "/F", "/PID", str(proc.pid)],
             capture_output=True,
-            stdin=subprocess.DEVNULL,
-            text=True,
-            encoding="utf-8",
-            errors="replace",
             check=False,
-            env=env,
-            timeout=20,
         )
+    else:
+        proc.kill()
+
+
+def _hidden_spawn_options() -> dict[str, object]:
+    if os.name != "nt":
+        return {"creationflags": _CREATE_NEW_PROCESS_GROUP}
+    startupinfo = subprocess.STARTUPINFO()
+    startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+    startupinfo.wShowWindow = 0  # SW_HIDE
+    return {
+        "creationflags": _CREATE_NEW_PROCESS_GROUP | _CREATE_NO_WINDOW,
+        "startupinfo": startupinfo,
+        "close_fds": False,
+    }
+
+
+def _needs_powershell(tool: str) -> bool:
+    return tool.lower().endswith(".ps1")
+
+
+def _run_probe(tool: str, env: dict[str, str]) -> subprocess.CompletedProcess[str]:
+    if _needs_powershell(tool):
+        argv = [_POWERSHELL, "-NoProfile", "-Command", _PROBE_COMMAND]
+    else:
+        argv = [tool, *_PROBE_ARGS]
+    proc = subprocess.Popen(  # noqa: S603 - command assembled from trusted args
+        argv,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        encoding="utf-8",
+        errors="replace",
+        env=env,
+        **_hidden_spawn_options(),
+    )
+    try:
+        stdout, stderr = proc.communicate(timeout=20)
     except subprocess.TimeoutExpired as exc:
-        stdout_raw = exc.stdout or ""
-        stderr_raw = (
-            exc.stderr or "Probe timed out (Copilot CLI likely awaits trust or /login)."
-        )
-        stdout_text = (
-            stdout_raw.decode("utf-8", "replace")
-            if isinstance(stdout_raw, bytes)
-            else stdout_raw
-        )
+        # Killing PowerShell alone leaves the Node-based Copilot grandchild holding
+        # the pipes open, so reap the whole process tree before draining output.
+        _kill_process_tree(proc)
+        try:
+            stdout_text, stderr_text = proc.communicate(timeout=5)
+        except subprocess.TimeoutExpired:
+            stdout_text, stderr_text = "", ""
+        stdout_text = stdout_text or ""
         stderr_text = (
-            stderr_raw.decode("utf-8", "replace")
-            if isinstance(stderr_raw, bytes)
-            else stderr_raw
+            stderr_text or "Probe timed out (Copilot CLI likely awaits trust or /login)."
         )
         failure = subprocess.CompletedProcess(
             args=exc.cmd,
@@ -128,15 +181,21 @@ def _run_probe(env: dict[str, str]) -> subprocess.CompletedProcess[str]:
             stderr=stderr_text,
         )
         return cast("subprocess.CompletedProcess[str]", failure)
+    return subprocess.CompletedProcess(
+        args=proc.args,
+        returncode=proc.returncode,
+        stdout=stdout,
+        stderr=stderr,
+    )
 
 
-def _launch_interactive(env: dict[str, str]) -> None:
-    powershell = shutil.which("powershell") or "powershell"
-    command = (
-        "Set-ExecutionPolicy -Scope Process -ExecutionPolicy Bypass -Force; copilot"
-    )
+def _launch_interactive(tool: str, env: dict[str, str]) -> None:
+    if _needs_powershell(tool):
+        argv = [_POWERSHELL, "-NoProfile", "-Command", _LAUNCH_COMMAND]
+    else:
+        argv = [tool]
     subprocess.run(  # noqa: S603 - executes Copilot CLI under trusted env
-        [powershell, "-NoProfile", "-Command", command],
+        argv,
         env=env,
         check=False,
     )
@@ -157,7 +216,7 @@ def main() -> int:
         return 1
 
     env = _build_env(pat)
-    probe = _run_probe(env)
+    probe = _run_probe(tool, env)
 
     stdout = (probe.stdout or "").strip()
     stderr = (probe.stderr or "").strip()
@@ -172,7 +231,7 @@ def main() -> int:
         input("Open an interactive Copilot CLI session now? [Y/n]: ").strip().lower()
     )
     if answer in {"", "y", "yes"}:
-        _launch_interactive(env)
+        _launch_interactive(tool, env)
         return 0
 
     return 1
@@ -4,7 +4,11 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any, cast
+import copy
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+from typing import Any
 
 from x_make_common_x import (
     DEFAULT_PERSONA_PROMPT,
@@ -22,13 +26,12 @@ from x_make_common_x import (
 
 from . import who_is_jc
 
-if TYPE_CHECKING:
-    from collections.abc import Mapping
-
 
 class JohnConnorPersonaService(PersonaVettingService):
     """Vetting service that queries the Copilot-backed Who Is John Connor helper."""
 
+    _CACHE_SIZE = 128
+
     def __init__(
         self,
         *,
@@ -39,10 +42,33 @@ class JohnConnorPersonaService(PersonaVettingService):
         self._question_template = question_template
         self._model = model
         self._language = language
+        # Model, language, and template are fixed per instance, so persona_id is the key.
+        self._cache: OrderedDict[str, Any] = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    def lookup(
+        self,
+        persona_id: str,
+        *,
+        _fmt=format_persona_question,
+        _ext=extract_answer_text,
+        _score=score_from_answer,
+        _syn=synopsis_from_answer,
+        _tags=extract_tags,
+        _hi=extract_highlights,
+        _src=source_from_response,
+    ):
+        # Helpers are bound as keyword-only defaults so the hot path reads locals.
+        with self._cache_lock:
+            cached = self._cache.get(persona_id)
+            if cached is not None:
+                self._cache.move_to_end(persona_id)
+        if cached is not None:
+            # Hand out copies so a caller mutating its result cannot corrupt the cache.
+            return copy.deepcopy(cached)
 
-    def lookup(self, persona_id: str):
         try:
-            question = format_persona_question(persona_id, self._question_template)
+            question = _fmt(persona_id, self._question_template)
         except PersonaPromptError as exc:
             raise PersonaVettingError(str(exc)) from exc
 
@@ -55,27 +81,33 @@ class JohnConnorPersonaService(PersonaVettingService):
         except RuntimeError as exc:  # pragma: no cover - passthrough
             raise PersonaVettingError(str(exc)) from exc
 
-        response = cast("Mapping[str, Any]", response_raw)
-        answer = extract_answer_text(response)
-        score = score_from_answer(answer)
-        synopsis = synopsis_from_answer(answer)
-        tags = extract_tags(response)
-        reasons = extract_highlights(response)
-        display_name = _optional_str(response.get("question")) or persona_id
+        if __debug__:
+            assert isinstance(response_raw, Mapping)
+        response: Mapping[str, Any] = response_raw
+        answer = _ext(response)
+        score = _score(answer)
+        synopsis = _syn(answer)
+        tags = _tags(response)
+        reasons = _hi(response)
+        question_raw = response.get("question")
+        display_name = (
+            (question_raw.strip() or persona_id)
+            if isinstance(question_raw, str)
+            else persona_id
+        )
 
-        return self.build_result(
+        result = self.build_result(
             persona_id,
             score=score,
-            source=source_from_response(response),
+            source=_src(response),
             display_name=display_name,
             synopsis=synopsis,
             tags=tags,
             reasons=reasons,
         )
-
-
-def _optional_str(value: object) -> str | None:
-    if isinstance(value, str):
-        text = value.strip()
-        return text or None
-    return None
+        with self._cache_lock:
+            self._cache[persona_id] = copy.deepcopy(result)
+            self._cache.move_to_end(persona_id)
+            if len(self._cache) > self._CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return result
@@ -4,25 +4,45 @@
 
 from __future__ import annotations
 
+import atexit
+import base64
 import contextlib
+import ctypes
+import functools
 import getpass
+import hashlib
+import http.client
+import io
 import json
 import os
+import re
 import shutil
+import signal
+import ssl
 import subprocess
 import sys
 import tempfile
-import urllib.error
+import threading
+import time
+import urllib.parse
 import urllib.request
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import IO, Any, TypeVar
 
 try:
     import winreg  # type: ignore[import-not-found]
 except ModuleNotFoundError:  # pragma: no cover - non-Windows platforms
     winreg = None  # type: ignore[assignment]
 
+try:
+    import orjson  # type: ignore[import-not-found]
+except ModuleNotFoundError:  # pragma: no cover - optional speedup
+    orjson = None  # type: ignore[assignment]
+
 PROMPT = "Who is John Connor?"
-_TOKEN_CACHE: str | None = None
 _TOKEN_ENV_KEYS = (
     "COPILOT_REQUESTS_PAT",
     "COPILOT_REQUESTS_TOKEN",
@@ -45,11 +65,66 @@ _TOKEN_EXPORT_KEYS = (
     "GH_TOKEN",
     "GITHUB_TOKEN",
 )
+_T = TypeVar("_T")
 _DISABLE_PROMPT_FLAG = "WHO_IS_JC_DISABLE_TOKEN_PROMPT"
 _SETUP_HELPER_PATH = Path(__file__).with_name("SETUP_COPILOT_CLI.py")
-_SETUP_HELPER_ATTEMPTED = False
+_DEFAULT_CLI_TIMEOUT = 300.0
+_DEFAULT_ANSWER_CACHE_TTL = 3600.0
+_BASE_HEADERS: dict[str, str] = {
+    "Content-Type": "application/json",
+    "Accept": "application/json",
+    "User-Agent": "who_is_jc/1.0",
+    "Editor-Version": "who_is_jc/1.0",
+    "OpenAI-Intent": "conversation-panel",
+}
+_NPM_SHIM_SCRIPT_PATTERN = re.compile(r'"%dp0%\\([^"]+)"\s+%\*', re.IGNORECASE)
+_SYSTEM_MESSAGE: dict[str, str] = {
+    "role": "system",
+    "content": (
+        "You are GitHub Copilot answering a single user prompt without requiring "
+        "additional interaction. Provide concise, direct responses."
+    ),
+}
+_LANGUAGE_SUFFIXES: dict[str, str] = {
+    "es": (
+        "\n\nResponde en español latino, claro, cálido y con empatía. Si el contenido incluye "
+        "nombres propios en otro idioma, consérvalos."
+    ),
+    "en": "\n\nPlease answer in clear, friendly English suitable for all ages.",
+}
+_AUTH_ERROR_PATTERN = re.compile(
+    "|".join(
+        map(
+            re.escape,
+            (
+                "no authentication information",
+                "/login",
+                "authenticate with github",
+                "copilot can be authenticated",
+                "start 'copilot' and run the '/login'",
+            ),
+        ),
+    ),
+    re.IGNORECASE,
+)
+_HTTP_POOL: dict[tuple[str, str, int], list[http.client.HTTPConnection]] = {}
+_HTTP_POOL_LOCK = threading.Lock()
+
+
+@dataclass(slots=True)
+class _State:
+    """Process-wide helper state (resolved token, setup and prewarm flags, env cache)."""
+
+    token: str | None = None
+    setup_attempted: bool = False
+    prewarmed: bool = False
+    env_cache: dict[str, dict[str, str]] = field(default_factory=dict)
+
 
+_STATE = _State()
 
+
+@functools.lru_cache(maxsize=None)
 def _read_user_environment_variable(name: str) -> str | None:
     if os.name != "nt" or winreg is None:
         return None
@@ -65,67 +140,396 @@ def _read_user_environment_variable(name: str) -> str | None:
     return None
 
 
+def _cache_dir() -> Path:
+    base = os.environ.get("XDG_CACHE_HOME")
+    return (Path(base) if base else Path.home() / ".cache") / "who_is_jc"
+
+
+def _cache_disabled() -> bool:
+    raw = os.environ.get("WHO_IS_JC_NO_CACHE")
+    return raw is not None and raw.strip().lower() in {"1", "true", "yes", "on", "y"}
+
+
+@functools.lru_cache(maxsize=1)
+def _load_path_cache() -> dict[str, str]:
+    try:
+        data = json.loads((_cache_dir() / "paths.json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict):
+        return {}
+    return {k: v for k, v in data.items() if isinstance(k, str) and isinstance(v, str)}
+
+
+def _store_cached_path(key: str, path: str) -> None:
+    cache = _load_path_cache()
+    if cache.get(key) == path:
+        return
+    cache[key] = path
+    _write_cache_file(
+        _cache_dir() / "paths.json",
+        json.dumps(cache, indent=2).encode("utf-8"),
+    )
+
+
+def _write_cache_file(target: Path, data: bytes) -> None:
+    """Atomically replace ``target`` with ``data``; cache writes never fail the caller."""
+
+    with contextlib.suppress(OSError):
+        target.parent.mkdir(parents=True, exist_ok=True)
+        staging = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+        staging.write_bytes(data)
+        os.replace(staging, target)
+
+
+def _persisted_path(
+    key: str,
+) -> Callable[[Callable[[], str | None]], Callable[[], str | None]]:
+    """Reuse an executable path resolved by a previous run while it still exists on disk."""
+
+    def decorator(finder: Callable[[], str | None]) -> Callable[[], str | None]:
+        @functools.wraps(finder)
+        def wrapper() -> str | None:
+            if _cache_disabled():
+                return finder()
+            cached = _load_path_cache().get(key)
+            if cached and os.path.isfile(cached):
+                return cached
+            found = finder()
+            if found:
+                _store_cached_path(key, found)
+            return found
+
+        return wrapper
+
+    return decorator
+
+
+def _json_dumps_bytes(value: object) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value).encode("utf-8")
+
+
+def _json_loads(raw: bytes) -> Any:
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers catch either.
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
 def _failure(code: int, message: str) -> tuple[int, str, str]:
     return code, "", f"{message}\n"
 
 
-def _query_copilot_http(
-    question: str,
-    token: str,
+def _route(url: str) -> tuple[tuple[str, str, int], str, dict[str, str]]:
+    """Return the pool key, request target, and proxy headers for ``url``.
+
+    Proxies come from ``urllib.request.getproxies()``, which reads ``HTTPS_PROXY``
+    and friends and, on Windows, the Internet Settings registry proxy, matching
+    what ``urllib.request.urlopen`` used to honour.
+    """
+
+    parts = urllib.parse.urlsplit(url)
+    scheme = parts.scheme.lower()
+    if scheme not in {"http", "https"} or not parts.hostname:
+        msg = f"Unsupported URL: {url}"
+        raise http.client.InvalidURL(msg)
+    port = parts.port or (443 if scheme == "https" else 80)
+    target = parts.path or "/"
+    if parts.query:
+        target = f"{target}?{parts.query}"
+    proxy = _proxy_for(scheme, parts.hostname)
+    if proxy is not None and scheme == "http":
+        # Plain HTTP goes through the proxy with an absolute-form request target.
+        return (scheme, parts.hostname, port), url, _proxy_headers(proxy)
+    return (scheme, parts.hostname, port), target, {}
+
+
+def _proxy_for(scheme: str, host: str) -> urllib.parse.SplitResult | None:
+    if urllib.request.proxy_bypass(host):
+        return None
+    proxy = urllib.request.getproxies().get(scheme)
+    if not proxy:
+        return None
+    if "://" not in proxy:
+        proxy = f"http://{proxy}"
+    parts = urllib.parse.urlsplit(proxy)
+    return parts if parts.hostname else None
+
+
+def _proxy_headers(proxy: urllib.parse.SplitResult) -> dict[str, str]:
+    if not proxy.username:
+        return {}
+    credentials = (
+        f"{urllib.parse.unquote(proxy.username)}:"
+        f"{urllib.parse.unquote(proxy.password or '')}"
+    )
+    encoded = base64.b64encode(credentials.encode("utf-8")).decode("ascii")
+    return {"Proxy-Authorization": f"Basic {encoded}"}
+
+
+@functools.lru_cache(maxsize=1)
+def _tls_context() -> ssl.SSLContext:
+    """Return the TLS context shared by every HTTPS connection.
+
+    Call it on the main thread before handing HTTPS work to a daemon thread: loading
+    the certificate store there crashes the interpreter if it exits mid-load.
+    """
+
+    return ssl.create_default_context()
+
+
+def _new_connection(
+    key: tuple[str, str, int],
+    timeout: float,
+) -> http.client.HTTPConnection:
+    scheme, host, port = key
+    proxy = _proxy_for(scheme, host)
+    if proxy is None:
+        if scheme == "https":
+            return http.client.HTTPSConnection(
+                host,
+                port,
+                timeout=timeout,
+                context=_tls_context(),
+            )
+        return http.client.HTTPConnection(host, port, timeout=timeout)
+    proxy_port = proxy.port or (443 if proxy.scheme == "https" else 80)
+    if scheme == "https":
+        connection = http.client.HTTPSConnection(
+            proxy.hostname,
+            proxy_port,
+            timeout=timeout,
+            context=_tls_context(),
+        )
+        connection.set_tunnel(host, port, headers=_proxy_headers(proxy))
+        return connection
+    return http.client.HTTPConnection(proxy.hostname, proxy_port, timeout=timeout)
+
+
+def _checkout_connection(
+    key: tuple[str, str, int],
+    timeout: float,
+) -> tuple[http.client.HTTPConnection, bool]:
+    """Return a connection for ``key`` and whether it was reused from the pool."""
+
+    with _HTTP_POOL_LOCK:
+        idle = _HTTP_POOL.get(key)
+        connection = idle.pop() if idle else None
+    if connection is None:
+        return _new_connection(key, timeout), False
+    connection.timeout = timeout
+    if connection.sock is not None:
+        connection.sock.settimeout(timeout)
+    return connection, True
+
+
+def _checkin_connection(
+    key: tuple[str, str, int],
+    connection: http.client.HTTPConnection,
+) -> None:
+    with _HTTP_POOL_LOCK:
+        _HTTP_POOL.setdefault(key, []).append(connection)
+
+
+@contextlib.contextmanager
+def _pooled_response(
+    method: str,
+    url: str,
     *,
-    model: str | None = None,
-) -> tuple[str, dict[str, object]]:
-    endpoint = os.environ.get(
+    headers: dict[str, str],
+    body: bytes | None = None,
+    timeout: float = 60,
+    pooled: bool = True,
+) -> Iterator[http.client.HTTPResponse]:
+    """Yield a response read over a pooled keep-alive connection.
+
+    The connection is checked out of the pool for the duration of the request, so
+    the pool lock is never held across network I/O. With ``pooled=False`` a fresh
+    connection is used and closed afterwards, which suits one-off bulk transfers.
+    """
+
+    key, target, proxy_headers = _route(url)
+    request_headers = {**headers, **proxy_headers} if proxy_headers else headers
+    if pooled:
+        connection, reused = _checkout_connection(key, timeout)
+    else:
+        connection, reused = _new_connection(key, timeout), False
+    reusable = False
+    try:
+        try:
+            connection.request(method, target, body=body, headers=request_headers)
+            response = connection.getresponse()
+        except (
+            http.client.RemoteDisconnected,
+            ConnectionResetError,
+            ConnectionAbortedError,
+            BrokenPipeError,
+        ):
+            # Only a reused idle socket may have been dropped by the server; a fresh
+            # connection failing here means the request may have been processed.
+            if not reused:
+                raise
+            connection.close()
+            connection.request(method, target, body=body, headers=request_headers)
+            response = connection.getresponse()
+        yield response
+        if pooled:
+            # Drain anything the caller left unread so the socket can be reused.
+            response.read()
+            reusable = not response.will_close
+    finally:
+        if reusable:
+            _checkin_connection(key, connection)
+        else:
+            connection.close()
+
+
+def _http_request(
+    method: str,
+    url: str,
+    *,
+    headers: dict[str, str],
+    body: bytes | None = None,
+    timeout: float = 60,
+) -> tuple[int, str, bytes]:
+    """Send a request over a pooled keep-alive connection and return (status, reason, body)."""
+
+    with _pooled_response(
+        method,
+        url,
+        headers=headers,
+        body=body,
+        timeout=timeout,
+    ) as response:
+        return response.status, response.reason, response.read()
+
+
+def _http_download(url: str, destination: Path, *, timeout: float = 60) -> None:
+    """Stream ``url`` into ``destination`` in 1 MiB chunks, following redirects."""
+
+    headers = {"User-Agent": _BASE_HEADERS["User-Agent"]}
+    for _redirect in range(5):
+        with _pooled_response(
+            "GET",
+            url,
+            headers=headers,
+            timeout=timeout,
+            pooled=False,
+        ) as response:
+            if response.status in {301, 302, 303, 307, 308}:
+                location = response.getheader("Location")
+                if not location:
+                    msg = f"Redirect from {url} did not include a Location header"
+                    raise http.client.HTTPException(msg)
+                url = urllib.parse.urljoin(url, location)
+                continue
+            if response.status >= 400:
+                msg = f"Download failed ({response.status} {response.reason}): {url}"
+                raise http.client.HTTPException(msg)
+            with destination.open("wb") as handle:
+                shutil.copyfileobj(response, handle, 1 << 20)
+            return
+    msg = f"Too many redirects while downloading {url}"
+    raise http.client.HTTPException(msg)
+
+
+@atexit.register
+def _close_http_pool() -> None:
+    # Only idle connections live in the pool; in-flight requests hold their own.
+    # Never wait for the lock at exit: the OS reclaims any sockets left behind.
+    if not _HTTP_POOL_LOCK.acquire(blocking=False):
+        return
+    try:
+        idle = [connection for group in _HTTP_POOL.values() for connection in group]
+        _HTTP_POOL.clear()
+    finally:
+        _HTTP_POOL_LOCK.release()
+    for connection in idle:
+        connection.close()
+
+
+def _copilot_endpoint() -> str:
+    return os.environ.get(
         "COPILOT_API_URL",
         "https://copilot-proxy.githubusercontent.com/v1/chat/completions",
     )
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Content-Type": "application/json",
-        "Accept": "application/json",
-        "User-Agent": "who_is_jc/1.0",
-        "Editor-Version": "who_is_jc/1.0",
-        "OpenAI-Intent": "conversation-panel",
-    }
-    payload = {
-        "model": model or os.environ.get("COPILOT_MODEL", "gpt-4o-mini"),
-        "messages": [
-            {
-                "role": "system",
-                "content": (
-                    "You are GitHub Copilot answering a single user prompt without requiring "
-                    "additional interaction. Provide concise, direct responses."
-                ),
-            },
-            {"role": "user", "content": question},
-        ],
+
+
+def _http_fallback_allowed() -> bool:
+    raw = os.environ.get("COPILOT_HTTP_FALLBACK")
+    if raw is None:
+        return True
+    return raw.strip().lower() in {"1", "true", "yes", "on", "y"}
+
+
+def _prewarm_http_connection() -> None:
+    """Open a pooled connection to the Copilot endpoint on a daemon thread."""
+
+    if _STATE.prewarmed:
+        return
+    _STATE.prewarmed = True
+    _tls_context()
+
+    def warm() -> None:
+        with contextlib.suppress(OSError, http.client.HTTPException):
+            _http_request("HEAD", _copilot_endpoint(), headers={}, timeout=5)
+
+    threading.Thread(target=warm, name="who_is_jc-prewarm", daemon=True).start()
+
+
+def _build_payload(question: str, model: str) -> dict[str, object]:
+    """Return a fresh chat request payload that callers are free to mutate."""
+
+    return {
+        "model": model,
+        "messages": [dict(_SYSTEM_MESSAGE), {"role": "user", "content": question}],
         "temperature": 0.2,
         "max_tokens": 1024,
         "stream": False,
     }
-    data = json.dumps(payload).encode("utf-8")
-    request = urllib.request.Request(
-        endpoint,
-        data=data,
-        headers=headers,
-        method="POST",
-    )  # noqa: S310 - endpoint is user-configurable but constrained via env
+
+
+@functools.lru_cache(maxsize=32)
+def _encoded_payload(question: str, model: str) -> bytes:
+    """Return the encoded request body, memoized for retries of the same question."""
+
+    return _json_dumps_bytes(_build_payload(question, model))
+
+
+def _query_copilot_http(
+    question: str,
+    token: str,
+    *,
+    model: str | None = None,
+) -> tuple[str, dict[str, object]]:
+    endpoint = _copilot_endpoint()
+    headers = {**_BASE_HEADERS, "Authorization": f"Bearer {token}"}
+    model_name = model or os.environ.get("COPILOT_MODEL", "gpt-4o-mini")
+    payload = _build_payload(question, model_name)
+    data = _encoded_payload(question, model_name)
     try:
-        with urllib.request.urlopen(request, timeout=60) as response:  # noqa: S310
-            raw_bytes = response.read()
-            body = raw_bytes.decode("utf-8")
-    except urllib.error.HTTPError as exc:
-        detail = exc.read().decode("utf-8", errors="ignore") if exc.fp else exc.reason
-        msg = f"Copilot HTTP request failed ({exc.code}): {detail}"
-        raise RuntimeError(msg) from exc
+        status, reason, raw_bytes = _http_request(
+            "POST",
+            endpoint,
+            headers=headers,
+            body=data,
+            timeout=60,
+        )
     except (
-        urllib.error.URLError
+        OSError,
+        http.client.HTTPException,
     ) as exc:  # pragma: no cover - network failures vary by environment
-        msg = f"Copilot HTTP request failed: {exc.reason}"
+        msg = f"Copilot HTTP request failed: {exc}"
         raise RuntimeError(msg) from exc
+    if status >= 400:
+        detail = raw_bytes.decode("utf-8", errors="ignore") or reason
+        msg = f"Copilot HTTP request failed ({status}): {detail}"
+        raise RuntimeError(msg)
 
     try:
-        payload_obj = json.loads(body)
+        payload_obj = _json_loads(raw_bytes)
     except json.JSONDecodeError as exc:
         msg = f"Copilot HTTP response was not valid JSON: {exc}"
         raise RuntimeError(msg)
@@ -146,8 +550,7 @@ def _query_copilot_http(
     return content.strip(), payload
 
 
-def _path_variants(executable_names: list[str]) -> list[Path]:
-    candidates: list[Path] = []
+def _path_variants(executable_names: list[str]) -> Iterator[Path]:
     program_files_raw = os.environ.get("PROGRAMFILES") or r"C:\\Program Files"
     program_files = Path(program_files_raw)
     local_app_data_raw = os.environ.get("LOCALAPPDATA") or ""
@@ -155,42 +558,38 @@ def _path_variants(executable_names: list[str]) -> list[Path]:
 
     for name in executable_names:
         exe_name = Path(name)
-        candidates.extend(
-            [
-                program_files / "GitHub" / "Copilot" / exe_name,
-                program_files / "GitHub Copilot" / exe_name,
-            ],
-        )
+        yield program_files / "GitHub" / "Copilot" / exe_name
+        yield program_files / "GitHub Copilot" / exe_name
         if local_app_data:
-            candidates.extend(
-                [
-                    local_app_data / "Programs" / "GitHub" / "Copilot" / exe_name,
-                    local_app_data / "Programs" / exe_name,
-                ],
-            )
+            yield local_app_data / "Programs" / "GitHub" / "Copilot" / exe_name
+            yield local_app_data / "Programs" / exe_name
 
     path_dirs = os.environ.get("PATH", "").split(os.pathsep)
     for directory in path_dirs:
         if not directory:
             continue
         base = Path(directory)
-        candidates.extend(base / name for name in executable_names)
-    return candidates
+        for name in executable_names:
+            yield base / name
 
 
+@functools.lru_cache(maxsize=None)
+@_persisted_path("winget")
 def _find_winget() -> str | None:
     system_root = Path(os.environ.get("SYSTEMROOT") or r"C:\\Windows")
     winget_path = system_root / "System32" / "winget.exe"
-    if winget_path.exists():
+    if os.path.isfile(winget_path):
         return str(winget_path)
     local_app_data = os.environ.get("LOCALAPPDATA")
     if local_app_data:
         candidate = Path(local_app_data) / "Microsoft" / "WindowsApps" / "winget.exe"
-        if candidate.exists():
+        if os.path.isfile(candidate):
             return str(candidate)
     return None
 
 
+@functools.lru_cache(maxsize=None)
+@_persisted_path("copilot_cli")
 def _find_copilot_cli_executable() -> str | None:
     names = [
         "github-copilot-cli.exe",
@@ -203,7 +602,7 @@ def _find_copilot_cli_executable() -> str | None:
         "copilot",
     ]
     for candidate in _path_variants(names):
-        if candidate.exists():
+        if os.path.isfile(candidate):
             return str(candidate)
     return None
 
@@ -293,6 +692,8 @@ def _install_gh_cli_via_winget() -> bool:
     return True
 
 
+@functools.lru_cache(maxsize=None)
+@_persisted_path("npm")
 def _find_npm() -> str | None:
     npm = shutil.which("npm")
     if npm:
@@ -349,9 +750,7 @@ def _install_gh_cli_via_msi() -> bool:
     try:
         with tempfile.NamedTemporaryFile(suffix=".msi", delete=False) as handle:
             tmp_path = Path(handle.name)
-        urllib.request.urlretrieve(
-            url, str(tmp_path)
-        )  # noqa: S310 - trusted release URL
+        _http_download(url, tmp_path, timeout=60)
         sys.stderr.write("Download complete. Installing...\n")
         system_root = Path(os.environ.get("SYSTEMROOT") or r"C:\\Windows")
         msiexec = system_root / "System32" / "msiexec.exe"
@@ -386,6 +785,8 @@ def _install_gh_cli_via_msi() -> bool:
                 tmp_path.unlink(missing_ok=True)
 
 
+@functools.lru_cache(maxsize=None)
+@_persisted_path("gh")
 def _find_gh_executable() -> str | None:
     gh_candidates: list[Path] = []
     program_files = os.environ.get("PROGRAMFILES") or r"C:\\Program Files"
@@ -399,7 +800,7 @@ def _find_gh_executable() -> str | None:
     gh_candidates.extend(Path(d) / "gh.exe" for d in path_dirs if d)
 
     for candidate in gh_candidates:
-        if candidate.exists():
+        if os.path.isfile(candidate):
             return str(candidate)
     return None
 
@@ -412,7 +813,7 @@ def _token_prompt_allowed() -> bool:
     return lowered not in {"1", "true", "yes", "on", "y"}
 
 
-def _resolve_token() -> str | None:
+def _lookup_token() -> str | None:
     env = os.environ
     direct = env.get("COPILOT_REQUESTS_PAT")
     if direct:
@@ -430,25 +831,39 @@ def _resolve_token() -> str | None:
             value = _read_user_environment_variable(key)
             if value:
                 return value.strip()
-    global _TOKEN_CACHE
-    return _TOKEN_CACHE
+    return None
+
+
+def _resolve_token() -> str | None:
+    if _STATE.token is None:
+        _STATE.token = _lookup_token()
+    return _STATE.token
+
 
+def _copilot_env(prompt: bool = False) -> dict[str, str] | None:
+    """Return the Copilot subprocess environment, or None to inherit os.environ.
+
+    The mapping is cached per token and shared between callers; do not mutate it.
+    """
 
-def _copilot_env(prompt: bool = False) -> dict[str, str]:
-    env = dict(os.environ)
-    global _TOKEN_CACHE
     token = _resolve_token()
     if prompt and token is None and _token_prompt_allowed():
         new_token = _prompt_for_token()
         if new_token:
-            _TOKEN_CACHE = new_token
+            _STATE.token = new_token
             token = new_token
-    if token:
-        for key in _TOKEN_EXPORT_KEYS:
-            if key in {"GITHUB_TOKEN", "GH_TOKEN"} and env.get(key):
-                continue
-            env[key] = token
-    return env
+    if not token:
+        return None
+    cached = _STATE.env_cache.get(token)
+    if cached is None:
+        env = os.environ
+        cached = env | {
+            key: token
+            for key in _TOKEN_EXPORT_KEYS
+            if not (key in {"GITHUB_TOKEN", "GH_TOKEN"} and env.get(key))
+        }
+        _STATE.env_cache[token] = cached
+    return cached
 
 
 def _prompt_for_token() -> str | None:
@@ -477,12 +892,54 @@ def _prompt_for_token() -> str | None:
     return token
 
 
+def _write_user_environment_variables(names: tuple[str, ...], value: str) -> bool:
+    if os.name != "nt" or winreg is None:
+        return False
+    try:
+        with winreg.OpenKey(  # type: ignore[attr-defined]
+            winreg.HKEY_CURRENT_USER,
+            "Environment",
+            0,
+            winreg.KEY_SET_VALUE,
+        ) as key:
+            for name in names:
+                winreg.SetValueEx(key, name, 0, winreg.REG_SZ, value)
+    except OSError:
+        return False
+    _read_user_environment_variable.cache_clear()
+    _broadcast_environment_change()
+    return True
+
+
+def _broadcast_environment_change() -> None:
+    """Tell running shells that HKCU\\Environment changed, as setx does."""
+
+    hwnd_broadcast = 0xFFFF
+    wm_settingchange = 0x001A
+    smto_abortifhung = 0x0002
+    with contextlib.suppress(AttributeError, OSError):
+        ctypes.windll.user32.SendMessageTimeoutW(  # type: ignore[attr-defined]
+            hwnd_broadcast,
+            wm_settingchange,
+            0,
+            "Environment",
+            smto_abortifhung,
+            5000,
+            None,
+        )
+
+
 def _persist_token(token: str) -> None:
+    targets = ("COPILOT_REQUESTS_PAT", "GH_TOKEN", "GITHUB_TOKEN")
+    if _write_user_environment_variables(targets, token):
+        sys.stderr.write(
+            "Token persisted to COPILOT_REQUESTS_PAT, GH_TOKEN, and GITHUB_TOKEN. Restart terminals to pick up the new values.\n",
+        )
+        return
     setx = shutil.which("setx")
     if setx is None:
         sys.stderr.write("setx.exe not found; unable to persist token automatically.\n")
         return
-    targets = ("COPILOT_REQUESTS_PAT", "GH_TOKEN", "GITHUB_TOKEN")
     last_variable = None
     try:
         for variable in targets:
@@ -493,6 +950,7 @@ def _persist_token(token: str) -> None:
                 capture_output=True,
                 text=True,
             )
+        _read_user_environment_variable.cache_clear()
         sys.stderr.write(
             "Token persisted to COPILOT_REQUESTS_PAT, GH_TOKEN, and GITHUB_TOKEN. Restart terminals to pick up the new values.\n",
         )
@@ -506,10 +964,9 @@ def _persist_token(token: str) -> None:
 def _invoke_setup_helper() -> bool:
     """Run the setup helper once and report whether Copilot should be retried."""
 
-    global _SETUP_HELPER_ATTEMPTED
-    if _SETUP_HELPER_ATTEMPTED:
+    if _STATE.setup_attempted:
         return False
-    _SETUP_HELPER_ATTEMPTED = True
+    _STATE.setup_attempted = True
 
     if not _SETUP_HELPER_PATH.exists():
         sys.stderr.write(
@@ -540,64 +997,215 @@ def _invoke_setup_helper() -> bool:
 
 
 def _is_auth_error(output: str) -> bool:
-    lowered = output.lower()
-    indicators = (
-        "no authentication information",
-        "/login",
-        "authenticate with github",
-        "copilot can be authenticated",
-        "start 'copilot' and run the '/login'",
-    )
-    return any(indicator in lowered for indicator in indicators)
+    return _AUTH_ERROR_PATTERN.search(output) is not None
 
 
-def _run_copilot_cli(prompt: str, *, model: str | None = None) -> tuple[int, str, str]:
-    exe = _find_copilot_cli_executable()
-    if exe is None:
-        if not _install_copilot_cli():
-            return _failure(
-                128,
-                "Unable to install the GitHub Copilot CLI automatically. Install it manually and retry.",
-            )
-        exe = _find_copilot_cli_executable()
-        if exe is None:
-            return _failure(
-                128,
-                "GitHub Copilot CLI installation did not expose the executable. Install manually and retry.",
-            )
+def _npm_shim_command(shim: str) -> list[str] | None:
+    """Return ``[node, script]`` for an npm ``.cmd`` shim, or None if it is not one."""
 
-    prompt_payload = f"ask {prompt}" if not prompt.lower().startswith("ask") else prompt
-    powershell = shutil.which("powershell") or "powershell"
+    try:
+        text = Path(shim).read_text(encoding="utf-8", errors="replace")
+    except OSError:
+        return None
+    match = _NPM_SHIM_SCRIPT_PATTERN.search(text)
+    if match is None:
+        return None
+    shim_dir = Path(shim).parent
+    script = shim_dir / match.group(1).replace("\\", os.sep)
+    if not os.path.isfile(script):
+        return None
+    bundled_node = shim_dir / "node.exe"
+    node = (
+        str(bundled_node)
+        if os.path.isfile(bundled_node)
+        else shutil.which("node") or "node"
+    )
+    return [node, str(script)]
 
-    exe_literal = _ps_quote(exe)
-    prompt_literal = _ps_quote(prompt_payload)
-    command_parts = [
-        "Set-ExecutionPolicy -Scope Process -ExecutionPolicy Bypass -Force; ",
-        f"& {exe_literal} --prompt {prompt_literal} --allow-all-tools --stream off --no-color",
-    ]
+
+def _copilot_cli_argv(exe: str, prompt_payload: str, model: str | None) -> list[str]:
+    flags = ["--allow-all-tools", "--stream", "off", "--no-color"]
     if model:
-        command_parts.append(f" --model { _ps_quote(model) }")
-    command_text = "".join(command_parts)
+        flags.extend(("--model", model))
+
+    suffix = Path(exe).suffix.lower()
+    if suffix in {".cmd", ".bat"}:
+        # cmd.exe re-parses batch arguments and mangles quotes, %, & and newlines
+        # in the prompt, so run the npm shim's node entry point directly instead.
+        command = _npm_shim_command(exe)
+        if command is not None:
+            return [*command, "--prompt", prompt_payload, *flags]
+        # Any other batch launcher still ends up in cmd.exe, which stops reading the
+        # command line at the first line break; fold those into spaces so the flags
+        # after the prompt survive. Quotes and % remain subject to cmd.exe parsing.
+        prompt_payload = " ".join(prompt_payload.split())
+    if suffix in {".ps1", ".cmd", ".bat"}:
+        # Scripts that cannot be spawned directly go through PowerShell with
+        # single-quoted literals, which reach a .ps1 script verbatim.
+        powershell = shutil.which("powershell") or "powershell"
+        quoted_flags = " ".join(_ps_quote(flag) for flag in flags)
+        command_text = (
+            "Set-ExecutionPolicy -Scope Process -ExecutionPolicy Bypass -Force; "
+            f"& {_ps_quote(exe)} --prompt {_ps_quote(prompt_payload)} {quoted_flags}"
+        )
+        return [powershell, "-NoProfile", "-Command", command_text]
+    return [exe, "--prompt", prompt_payload, *flags]
+
+
+def _drain_stream(
+    stream: IO[str],
+    chunks: list[str],
+    on_line: Callable[[str], None] | None = None,
+) -> None:
+    for line in iter(stream.readline, ""):
+        chunks.append(line)
+        if on_line is not None:
+            on_line(line)
+    stream.close()
 
-    def execute(env: dict[str, str]) -> subprocess.CompletedProcess[str]:
-        return subprocess.run(
-            [powershell, "-NoProfile", "-Command", command_text],
-            env=env,
+
+def _kill_process_tree(proc: subprocess.Popen[str]) -> None:
+    # Wrapper shims (copilot.cmd, node) leave grandchildren holding our pipes open.
+    if os.name == "nt":
+        if proc.poll() is not None:
+            # taskkill cannot walk the tree of a process that has already exited.
+            return
+        subprocess.run(  # noqa: S603 - taskkill with fixed arguments
+            ["taskkill", "/T", "/F", "/PID", str(proc.pid)],
             capture_output=True,
-            text=True,
-            encoding="utf-8",
-            errors="replace",
             check=False,
         )
+    else:
+        with contextlib.suppress(OSError):
+            os.killpg(proc.pid, signal.SIGKILL)
+
+
+def _cli_timeout() -> float | None:
+    raw = os.environ.get("WHO_IS_JC_CLI_TIMEOUT")
+    if raw is None:
+        return _DEFAULT_CLI_TIMEOUT
+    try:
+        value = float(raw)
+    except ValueError:
+        return _DEFAULT_CLI_TIMEOUT
+    return value if value > 0 else None
+
+
+def _run_streaming(
+    argv: list[str],
+    env: dict[str, str] | None,
+    *,
+    timeout: float | None = None,
+) -> subprocess.CompletedProcess[str]:
+    """Run the Copilot CLI, draining both pipes as output arrives.
+
+    The process tree is killed as soon as stderr reports an authentication error,
+    or once ``timeout`` seconds pass, so the caller can move on to the token
+    prompt or setup helper without waiting for the CLI to give up on its own.
+    """
+
+    stdout_chunks: list[str] = []
+    stderr_chunks: list[str] = []
+    timed_out = False
+    deadline = None if timeout is None else time.monotonic() + timeout
+    proc = subprocess.Popen(
+        argv,
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        encoding="utf-8",
+        errors="replace",
+        bufsize=1,
+        start_new_session=os.name != "nt",
+    )
+
+    def watch(line: str) -> None:
+        if _is_auth_error(line):
+            _kill_process_tree(proc)
+
+    # Only stderr is watched: answer text on stdout may legitimately mention /login.
+    readers = [
+        threading.Thread(
+            target=_drain_stream,
+            args=(proc.stdout, stdout_chunks),
+            daemon=True,
+        ),
+        threading.Thread(
+            target=_drain_stream,
+            args=(proc.stderr, stderr_chunks, watch),
+            daemon=True,
+        ),
+    ]
+    for reader in readers:
+        reader.start()
+    try:
+        proc.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        timed_out = True
+        _kill_process_tree(proc)
+        proc.wait()
+    for reader in readers:
+        reader.join(None if deadline is None else max(deadline - time.monotonic(), 0))
+    if any(reader.is_alive() for reader in readers):
+        # The CLI exited but a grandchild still holds the pipes open. Kill what is
+        # left of the tree and leave the daemon readers behind instead of blocking
+        # past the deadline.
+        _kill_process_tree(proc)
+        for reader in readers:
+            reader.join(1)
+    if timed_out:
+        stderr_chunks.append(f"Copilot CLI did not finish within {timeout:g} seconds.\n")
+    return subprocess.CompletedProcess(
+        argv,
+        124 if timed_out else proc.returncode,
+        "".join(stdout_chunks),
+        "".join(stderr_chunks),
+    )
+
+
+def _install_and_find_copilot_cli() -> str | tuple[int, str, str]:
+    """Install the Copilot CLI and return its path, or a failure triple."""
+
+    if not _install_copilot_cli():
+        return _failure(
+            128,
+            "Unable to install the GitHub Copilot CLI automatically. Install it manually and retry.",
+        )
+    _find_copilot_cli_executable.cache_clear()
+    exe = _find_copilot_cli_executable()
+    if exe is None:
+        return _failure(
+            128,
+            "GitHub Copilot CLI installation did not expose the executable. Install manually and retry.",
+        )
+    return exe
+
+
+def _run_copilot_cli(
+    prompt: str,
+    *,
+    model: str | None = None,
+    on_auth_error: Callable[[], None] | None = None,
+) -> tuple[int, str, str]:
+    exe = _find_copilot_cli_executable() or _install_and_find_copilot_cli()
+    if isinstance(exe, tuple):
+        return exe
+
+    prompt_payload = f"ask {prompt}" if not prompt.lower().startswith("ask") else prompt
+    argv = _copilot_cli_argv(exe, prompt_payload, model)
+
+    def execute(env: dict[str, str] | None) -> subprocess.CompletedProcess[str]:
+        return _run_streaming(argv, env, timeout=_cli_timeout())
 
     attempted_prompt = False
     next_prompt = False
 
     while True:
-        env = _copilot_env(prompt=True) if next_prompt else dict(os.environ)
+        env = _copilot_env(prompt=True) if next_prompt else None
         next_prompt = False
         if model:
-            env["COPILOT_MODEL"] = model
+            env = {**(env or os.environ), "COPILOT_MODEL": model}
         result = execute(env)
         stdout = result.stdout or ""
         stderr = result.stderr or ""
@@ -605,6 +1213,8 @@ def _run_copilot_cli(prompt: str, *, model: str | None = None) -> tuple[int, str
         auth_error = _is_auth_error(combined)
         if result.returncode == 0 and not auth_error:
             return 0, stdout, stderr
+        if auth_error and on_auth_error is not None:
+            on_auth_error()
 
         token_available = _resolve_token() is not None
         if (
@@ -615,6 +1225,9 @@ def _run_copilot_cli(prompt: str, *, model: str | None = None) -> tuple[int, str
         ):
             attempted_prompt = True
             next_prompt = True
+            if _http_fallback_allowed():
+                # The token prompt comes next; open the connection while the user types.
+                _prewarm_http_connection()
             continue
 
         if auth_error:
@@ -644,11 +1257,12 @@ def _copilot_command_available(gh_exe: str) -> bool:
     return probe.returncode == 0
 
 
-def _ensure_copilot_extension(gh_exe: str) -> bool:
+def _ensure_copilot_extension(gh_exe: str, log: IO[str] | None = None) -> bool:
+    log = sys.stderr if log is None else log
     if _copilot_command_available(gh_exe):
         return True
 
-    sys.stderr.write("Installing GitHub Copilot CLI extension...\n")
+    log.write("Installing GitHub Copilot CLI extension...\n")
     install = subprocess.run(
         [gh_exe, "extension", "install", "github/gh-copilot", "--force"],
         env=_copilot_env(),
@@ -657,21 +1271,22 @@ def _ensure_copilot_extension(gh_exe: str) -> bool:
         check=False,
     )
     if install.returncode != 0:
-        sys.stderr.write(install.stderr or install.stdout or "")
-        sys.stderr.write(
+        log.write(install.stderr or install.stdout or "")
+        log.write(
             "Failed to install the GitHub Copilot extension. You can install it manually with "
             "`gh extension install github/gh-copilot`.\n",
         )
         return False
     if _copilot_command_available(gh_exe):
         return True
-    sys.stderr.write(
+    log.write(
         "GitHub Copilot CLI extension did not register the `gh copilot` command. Install manually and retry.\n",
     )
     return False
 
 
-def _ensure_gh_auth(gh_exe: str) -> bool:
+def _ensure_gh_auth(gh_exe: str, log: IO[str] | None = None) -> bool:
+    log = sys.stderr if log is None else log
     status = subprocess.run(
         [gh_exe, "auth", "status"],
         env=_copilot_env(),
@@ -682,17 +1297,30 @@ def _ensure_gh_auth(gh_exe: str) -> bool:
     if status.returncode == 0:
         return True
 
-    sys.stderr.write(status.stderr or status.stdout or "")
-    sys.stderr.write(
+    log.write(status.stderr or status.stdout or "")
+    log.write(
         "GitHub CLI is not authenticated. Run `gh auth login` (use the account with Copilot access) and retry.\n",
     )
     return False
 
 
-def run_copilot_query(prompt: str, *, model: str | None = None) -> tuple[int, str, str]:
-    """Invoke Copilot CLI flows and return (exit_code, stdout, stderr)."""
-
-    code, stdout, stderr = _run_copilot_cli(prompt, model=model)
+def run_copilot_query(
+    prompt: str,
+    *,
+    model: str | None = None,
+    on_auth_error: Callable[[], None] | None = None,
+) -> tuple[int, str, str]:
+    """Invoke Copilot CLI flows and return (exit_code, stdout, stderr).
+
+    ``on_auth_error`` is called each time the Copilot CLI reports an authentication
+    error, before the token prompt or setup helper runs.
+    """
+
+    code, stdout, stderr = _run_copilot_cli(
+        prompt,
+        model=model,
+        on_auth_error=on_auth_error,
+    )
     if code == 0 or code not in (128, 127):
         return code, stdout, stderr
 
@@ -703,6 +1331,7 @@ def run_copilot_query(prompt: str, *, model: str | None = None) -> tuple[int, st
                 127,
                 "GitHub CLI is not installed. Install it from https://cli.github.com/ and retry.",
             )
+        _find_gh_executable.cache_clear()
         gh_exe = _find_gh_executable()
         if gh_exe is None:
             return _failure(
@@ -710,10 +1339,21 @@ def run_copilot_query(prompt: str, *, model: str | None = None) -> tuple[int, st
                 "GitHub CLI install did not yield gh.exe. Install manually and retry.",
             )
 
-    if not _ensure_copilot_extension(gh_exe):
+    # Both probes launch gh.exe; run them side by side instead of back to back, and
+    # replay their buffered messages in the order the sequential checks printed them.
+    extension_log, auth_log = io.StringIO(), io.StringIO()
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        extension_future = executor.submit(_ensure_copilot_extension, gh_exe, extension_log)
+        auth_future = executor.submit(_ensure_gh_auth, gh_exe, auth_log)
+        extension_ready = extension_future.result()
+        auth_ready = auth_future.result()
+
+    sys.stderr.write(extension_log.getvalue())
+    if not extension_ready:
         return _failure(127, "GitHub Copilot CLI extension is unavailable.")
 
-    if not _ensure_gh_auth(gh_exe):
+    sys.stderr.write(auth_log.getvalue())
+    if not auth_ready:
         return _failure(
             127,
             "GitHub CLI authentication is required. Run `gh auth login` and retry.",
@@ -729,6 +1369,69 @@ def run_copilot_query(prompt: str, *, model: str | None = None) -> tuple[int, st
     return result.returncode, result.stdout or "", result.stderr or ""
 
 
+def _apply_language_directive(question: str, language: str | None) -> str:
+    if not language:
+        return question
+    suffix = _LANGUAGE_SUFFIXES.get(language.strip().lower()[:2])
+    if suffix is None:
+        suffix = f"\n\nPlease answer in {language} with warmth and clarity."
+    return question + suffix
+
+
+def _answer_cache_path(
+    question: str,
+    model: str,
+    language: str | None,
+    *,
+    fallback: bool,
+) -> Path | None:
+    if _cache_disabled():
+        return None
+    digest = hashlib.blake2b(
+        f"{question}|{model}|{language or ''}|{'http' if fallback else 'cli'}".encode(),
+        digest_size=16,
+    ).hexdigest()
+    return _cache_dir() / "answers" / f"{digest}.json"
+
+
+def _answer_cache_ttl() -> float:
+    try:
+        return float(os.environ.get("WHO_IS_JC_CACHE_TTL", _DEFAULT_ANSWER_CACHE_TTL))
+    except ValueError:
+        return _DEFAULT_ANSWER_CACHE_TTL
+
+
+def _load_cached_answer(path: Path) -> dict[str, object] | None:
+    try:
+        if path.stat().st_mtime < time.time() - _answer_cache_ttl():
+            return None
+        cached = _json_loads(path.read_bytes())
+    except (OSError, ValueError):
+        return None
+    return cached if isinstance(cached, dict) else None
+
+
+def _run_in_background(
+    function: Callable[..., _T],
+    *args: object,
+    **kwargs: object,
+) -> Future[_T]:
+    """Run ``function`` on a daemon thread so an unused result never delays exit."""
+
+    future: Future[_T] = Future()
+
+    def runner() -> None:
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(function(*args, **kwargs))
+        except BaseException as exc:  # noqa: BLE001 - handed to the future's consumer
+            future.set_exception(exc)
+
+    threading.Thread(target=runner, name="who_is_jc-http", daemon=True).start()
+    return future
+
+
 def query_copilot(
     question: str = PROMPT,
     *,
@@ -738,7 +1441,31 @@ def query_copilot(
     """Return a dictionary containing the question, answer, and diagnostics."""
 
     effective_question = _apply_language_directive(question, language)
-    code, stdout, stderr = run_copilot_query(effective_question, model=model)
+    http_future: Future[tuple[str, dict[str, object]]] | None = None
+
+    def start_http_fallback() -> None:
+        # Start the HTTP request early so it runs during the token prompt, setup
+        # helper, and CLI retry. A successful CLI retry still takes precedence;
+        # the HTTP answer is only used once the retry has failed.
+        nonlocal http_future
+        if http_future is not None or not _http_fallback_allowed():
+            return
+        token = _resolve_token()
+        if not token:
+            return
+        _tls_context()
+        http_future = _run_in_background(
+            _query_copilot_http,
+            effective_question,
+            token,
+            model=model,
+        )
+
+    code, stdout, stderr = run_copilot_query(
+        effective_question,
+        model=model,
+        on_auth_error=start_http_fallback,
+    )
     answer = stdout.strip()
     message = stderr.strip() if stderr else ""
     model_effective = model or os.environ.get("COPILOT_MODEL") or "default"
@@ -760,24 +1487,14 @@ def query_copilot(
             "language": language,
         }
 
-    if code != 0:
+    if code != 0 and http_future is None:
         detail = message or stdout.strip() or f"Copilot CLI exited with status {code}"
         raise RuntimeError(detail)
 
-    token = _resolve_token()
-    fallback_raw = os.environ.get("COPILOT_HTTP_FALLBACK")
-    fallback_allowed = (
-        True
-        if fallback_raw is None
-        else fallback_raw.strip().lower() in {"1", "true", "yes", "on", "y"}
-    )
-    if token and fallback_allowed:
+    start_http_fallback()
+    if http_future is not None:
         try:
-            http_answer, http_payload = _query_copilot_http(
-                effective_question,
-                token,
-                model=model,
-            )
+            http_answer, http_payload = http_future.result()
         except Exception as exc:  # noqa: BLE001 - fallback path
             if not message:
                 message = str(exc)
@@ -794,6 +1511,9 @@ def query_copilot(
                     },
                     "language": language,
                 }
+    if code != 0:
+        detail = message or stdout.strip() or f"Copilot CLI exited with status {code}"
+        raise RuntimeError(detail)
     detail = (
         message
         or "Copilot returned an empty response. Run `copilot` interactively and complete `/login` once to authorize this PAT."
@@ -801,12 +1521,29 @@ def query_copilot(
     raise RuntimeError(detail)
 
 
+def _query_copilot_cached(question: str) -> dict[str, object]:
+    """Run :func:`query_copilot`, reusing a recent answer from the on-disk cache."""
+
+    fallback = _http_fallback_allowed()
+    model_effective = os.environ.get("COPILOT_MODEL") or "default"
+    cache_path = _answer_cache_path(question, model_effective, None, fallback=fallback)
+    if cache_path is not None:
+        cached = _load_cached_answer(cache_path)
+        # Never replay an HTTP-sourced answer once the fallback has been disabled.
+        if cached is not None and (fallback or cached.get("source") != "http"):
+            return cached
+    result = query_copilot(question)
+    if cache_path is not None:
+        _write_cache_file(cache_path, _json_dumps_bytes(result))
+    return result
+
+
 def main() -> None:
     args = sys.argv[1:]
     question = " ".join(args).strip() if args else ""
     question = question or PROMPT
     try:
-        result = query_copilot(question)
+        result = _query_copilot_cached(question)
     except RuntimeError as exc:
         sys.stderr.write(f"{exc}\n")
         sys.exit(1)
@@ -816,20 +1553,3 @@ def main() -> None:
 
 if __name__ == "__main__":
     main()
-
-
-def _apply_language_directive(question: str, language: str | None) -> str:
-    if not language:
-        return question
-    lang = language.strip().lower()
-    if lang.startswith("es"):
-        return (
-            question
-            + "\n\nResponde en español latino, claro, cálido y con empatía. Si el contenido incluye nombres propios en otro idioma, consérvalos."
-        )
-    if lang.startswith("en"):
-        return (
-            question
-            + "\n\nPlease answer in clear, friendly English suitable for all ages."
-        )
-    return question + f"\n\nPlease answer in {language} with warmth and clarity."